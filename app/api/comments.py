@@ -1,10 +1,20 @@
+"""
+Direct comment CRUD endpoints for the Post-Comments Service.
+
+Database errors are handled centrally by the SQLAlchemyError handler
+registered in app.main, so handlers stay free of try/except wrappers.
+"""
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from sqlmodel import select, func, delete, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Dict
 from datetime import datetime, timezone
 
+from app.cache import comment_cache, post_cache
 from app.database import get_db
 from app.models.comment import Comment
+from app.models.post import Post
 from app.schemas.comment import CommentResponse, CommentUpdate
 
 # Create router for direct comment operations
@@ -12,7 +22,9 @@ router = APIRouter(prefix="/comments", tags=["comments"])
 
 
 @router.get("/{comment_id}", response_model=CommentResponse)
-def get_comment(comment_id: int, db: Session = Depends(get_db)) -> CommentResponse:
+async def get_comment(
+    comment_id: int, db: AsyncSession = Depends(get_db)
+) -> CommentResponse:
     """
     Get a single comment by ID.
 
@@ -28,42 +40,29 @@ def get_comment(comment_id: int, db: Session = Depends(get_db)) -> CommentRespon
     Raises:
         HTTPException: 404 if comment not found, 500 for database errors
     """
-    try:
-        # Fetch comment by primary key
-        comment = db.get(Comment, comment_id)
-
-        # Check if comment exists
-        if not comment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Comment with ID {comment_id} not found",
-            )
-
-        # Build and return response
-        return CommentResponse(
-            id=comment.id,
-            content=comment.content,
-            author=comment.author,
-            post_id=comment.post_id,
-            parent_comment_id=comment.parent_comment_id,
-            created_at=comment.created_at,
-            updated_at=comment.updated_at,
-        )
+    # Serve repeated reads from the in-process cache when possible
+    cached = comment_cache.get(comment_id)
+    if cached is not None:
+        return cached
 
-    except HTTPException:
-        # Re-raise HTTP exceptions (like 404) without modification
-        raise
-    except Exception as e:
-        # Convert unexpected errors to HTTP 500
+    # Fetch comment by primary key
+    comment = await db.get(Comment, comment_id)
+
+    # Check if comment exists
+    if not comment:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve comment: {str(e)}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Comment with ID {comment_id} not found",
         )
 
+    # Cache and return the ORM row; response_model handles serialization
+    comment_cache[comment_id] = comment
+    return comment
+
 
 @router.put("/{comment_id}", response_model=CommentResponse)
-def update_comment(
-    comment_id: int, comment_data: CommentUpdate, db: Session = Depends(get_db)
+async def update_comment(
+    comment_id: int, comment_data: CommentUpdate, db: AsyncSession = Depends(get_db)
 ) -> CommentResponse:
     """
     Update a comment's content.
@@ -82,46 +81,32 @@ def update_comment(
     Raises:
         HTTPException: 404 if comment not found, 500 for database errors
     """
-    try:
-        # Find the comment to update
-        comment = db.get(Comment, comment_id)
-        if not comment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Comment with ID {comment_id} not found",
-            )
-
-        # Update the comment content
-        comment.content = comment_data.content
-        comment.updated_at = datetime.now(timezone.utc)
-
-        # Persist changes
-        db.commit()
-        db.refresh(comment)
-
-        # Return updated comment
-        return CommentResponse(
-            id=comment.id,
-            content=comment.content,
-            author=comment.author,
-            post_id=comment.post_id,
-            parent_comment_id=comment.parent_comment_id,
-            created_at=comment.created_at,
-            updated_at=comment.updated_at,
-        )
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
+    # Find the comment to update
+    comment = await db.get(Comment, comment_id)
+    if not comment:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update comment: {str(e)}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Comment with ID {comment_id} not found",
         )
 
+    # Update the comment content
+    comment.content = comment_data.content
+    # Naive UTC to match the form SQLite returns on subsequent reads
+    comment.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # Persist changes; expire_on_commit=False keeps the updated values
+    # readable without a refresh SELECT
+    await db.commit()
+    comment_cache.pop(comment_id, None)
+
+    # Return the updated ORM row directly
+    return comment
+
 
 @router.delete("/{comment_id}", status_code=status.HTTP_200_OK)
-def delete_comment(comment_id: int, db: Session = Depends(get_db)) -> Dict[str, str]:
+async def delete_comment(
+    comment_id: int, db: AsyncSession = Depends(get_db)
+) -> Dict[str, str]:
     """
     Delete a comment by ID.
 
@@ -138,27 +123,48 @@ def delete_comment(comment_id: int, db: Session = Depends(get_db)) -> Dict[str,
     Raises:
         HTTPException: 404 if comment not found, 500 for database errors
     """
-    try:
-        # Find the comment to delete
-        comment = db.get(Comment, comment_id)
-        if not comment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Comment with ID {comment_id} not found",
-            )
-
-        # Delete comment (replies will be cascade deleted if any exist)
-        db.delete(comment)
-        db.commit()
-
-        return {"message": f"Comment with ID {comment_id} deleted successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        # Rollback transaction on error
-        db.rollback()
+    # Enumerate the rows this delete will remove - the comment plus every
+    # descendant reply the FK cascade walks - so all their cache entries
+    # can be dropped; the first row also supplies the post id
+    victims = (
+        select(Comment.id, Comment.post_id)
+        .where(Comment.id == comment_id)
+        .cte("victims", recursive=True)
+    )
+    victims = victims.union_all(
+        select(Comment.id, Comment.post_id).join(
+            victims, Comment.parent_comment_id == victims.c.id
+        )
+    )
+    rows = (await db.exec(select(victims.c.id, victims.c.post_id))).all()
+    if not rows:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete comment: {str(e)}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Comment with ID {comment_id} not found",
         )
+    post_id = rows[0][1]
+
+    # Delete in a single statement instead of loading the ORM row;
+    # replies are cascade-deleted by the database-side FK
+    await db.exec(delete(Comment).where(Comment.id == comment_id))
+
+    # The database-side cascade bypasses the ORM counter events, so recount
+    # the surviving comments for the post in one UPDATE
+    await db.exec(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            comments_count=select(func.count())
+            .select_from(Comment)
+            .where(Comment.post_id == post_id)
+            .scalar_subquery()
+        )
+    )
+    await db.commit()
+
+    # Drop stale cache entries for every deleted comment and the post
+    for victim_id, _ in rows:
+        comment_cache.pop(victim_id, None)
+    post_cache.pop(post_id, None)
+
+    return {"message": f"Comment with ID {comment_id} deleted successfully"}
@@ -4,14 +4,24 @@ Posts API endpoints for the Post-Comments Service.
 This module handles all post-related operations including:
 - Creating, reading, and deleting posts
 - Managing comments on posts (nested under posts resource)
+
+Database errors are handled centrally by the SQLAlchemyError handler
+registered in app.main, so handlers stay free of try/except wrappers.
 """
 
+import asyncio
+import base64
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, func
+from sqlmodel import select, func, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
-from app.database import get_db
+from app.cache import comment_cache, post_cache
+from app.database import SessionLocal, get_db
 from app.models.post import Post
 from app.models.comment import Comment
 from app.schemas.post import PostCreate, PostResponse, PostListResponse
@@ -21,8 +31,46 @@ from app.schemas.comment import CommentListResponse, CommentResponse, CommentCre
 router = APIRouter(prefix="/posts", tags=["posts"])
 
 
+async def run_count(count_stmt: Select) -> int:
+    """
+    Run a COUNT on its own session so it can overlap the page query.
+
+    A single AsyncSession cannot execute two statements concurrently, so
+    list endpoints gather the count on a short-lived second session.
+    """
+    async with SessionLocal() as session:
+        return (await session.exec(count_stmt)).one()
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Serialize the last-seen (created_at, id) key into an opaque cursor token"""
+    return base64.urlsafe_b64encode(
+        f"{created_at.isoformat()}|{row_id}".encode()
+    ).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor token back into its (created_at, id) key.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        created_at_raw, row_id_raw = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at_raw), int(row_id_raw)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
-def create_post(post_data: PostCreate, db: Session = Depends(get_db)) -> PostResponse:
+async def create_post(
+    post_data: PostCreate, db: AsyncSession = Depends(get_db)
+) -> PostResponse:
     """
     Create a new post.
 
@@ -36,118 +84,97 @@ def create_post(post_data: PostCreate, db: Session = Depends(get_db)) -> PostRes
     Raises:
         HTTPException: 500 if database operation fails
     """
-    try:
-        # Create new post instance with current timestamps
-        db_post = Post(
-            title=post_data.title,
-            content=post_data.content,
-            author=post_data.author,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-        )
-
-        # Persist to database
-        db.add(db_post)
-        db.commit()
-        db.refresh(db_post)  # Refresh to get auto-generated fields
-
-        # Build response with comments count (will be 0 for new post)
-        return PostResponse(
-            id=db_post.id,
-            title=db_post.title,
-            content=db_post.content,
-            author=db_post.author,
-            created_at=db_post.created_at,
-            updated_at=db_post.updated_at,
-            comments_count=len(db_post.comments) if db_post.comments else 0,
-        )
-    except Exception as e:
-        # Rollback transaction on any error
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create post: {str(e)}",
-        )
+    # Create new post instance; read the clock once for both timestamps
+    # (naive UTC, the form SQLite returns on reads)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db_post = Post(
+        title=post_data.title,
+        content=post_data.content,
+        author=post_data.author,
+        created_at=now,
+        updated_at=now,
+    )
+
+    # Persist to database. The INSERT itself returns the generated id
+    # (SQLAlchemy uses RETURNING on SQLite >= 3.35) and
+    # expire_on_commit=False keeps the instance readable, so no refresh
+    # SELECT is needed
+    db.add(db_post)
+    await db.commit()
+
+    # Return the ORM row directly; the response_model serializes it via
+    # from_attributes, and a fresh post already carries comments_count=0
+    return db_post
 
 
 @router.get("/", response_model=PostListResponse)
-def get_posts(
-    page: int = 1, limit: int = 10, db: Session = Depends(get_db)
+async def get_posts(
+    cursor: Optional[str] = None, limit: int = 10, db: AsyncSession = Depends(get_db)
 ) -> PostListResponse:
     """
-    Get paginated list of posts.
+    Get paginated list of posts using keyset (cursor) pagination.
 
     Args:
-        page: Page number (starts from 1)
+        cursor: Opaque token from a previous page's next_cursor (None for first page)
         limit: Number of posts per page (1-100)
         db: Database session dependency
 
     Returns:
-        PostListResponse: Paginated list of posts with metadata
+        PostListResponse: Page of posts with a next_cursor token when more exist
 
     Raises:
         HTTPException: 400 for invalid pagination parameters, 500 for database errors
     """
     # Validate pagination parameters
-    if page < 1:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Page must be >= 1"
-        )
     if limit < 1 or limit > 100:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Limit must be between 1 and 100",
         )
 
-    try:
-        # Calculate offset for pagination
-        offset = (page - 1) * limit
-
-        # Get total count efficiently using SQL COUNT
-        total = db.exec(select(func.count()).select_from(Post)).one()
-
-        # Fetch posts with pagination and ordering
-        statement = (
-            select(Post)
-            .offset(offset)
-            .limit(limit)
-            .order_by(Post.created_at.desc())  # Latest posts first
-        )
-        posts = db.exec(statement).all()
-
-        # Convert to response format with comments count
-        post_responses = [
-            PostResponse(
-                id=post.id,
-                title=post.title,
-                content=post.content,
-                author=post.author,
-                created_at=post.created_at,
-                updated_at=post.updated_at,
-                comments_count=len(post.comments) if post.comments else 0,
-            )
-            for post in posts
-        ]
-
-        # Calculate total pages for pagination metadata
-        total_pages = (total + limit - 1) // limit
-
-        return PostListResponse(
-            posts=post_responses,
-            total=total,
-            page=page,
-            limit=limit,
-            total_pages=total_pages,
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch posts: {str(e)}",
+    cursor_key = decode_cursor(cursor) if cursor else None
+
+    # Fetch the page from posts alone; the denormalized comments_count
+    # column makes any join/aggregate unnecessary. Seeking on the
+    # (created_at, id) key keeps page cost independent of page depth,
+    # unlike OFFSET which scans and discards skipped rows.
+    statement = (
+        select(Post)
+        .order_by(Post.created_at.desc(), Post.id.desc())  # Latest posts first
+        .limit(limit)
+    )
+    if cursor_key:
+        statement = statement.where(tuple_(Post.created_at, Post.id) < cursor_key)
+
+    # Run the COUNT and the page query concurrently instead of sequentially
+    total, page_result = await asyncio.gather(
+        run_count(select(func.count()).select_from(Post)),
+        db.exec(statement),
+    )
+    if total == 0:
+        return PostListResponse.model_construct(
+            posts=[], total=0, limit=limit, next_cursor=None
         )
+    posts = page_result.all()
+
+    # Only a full page can have more rows after it
+    next_cursor = None
+    if len(posts) == limit:
+        last_post = posts[-1]
+        next_cursor = encode_cursor(last_post.created_at, last_post.id)
+
+    # Wrap without a validation pass; FastAPI's response_model step coerces
+    # the ORM rows into PostResponse once, via from_attributes
+    return PostListResponse.model_construct(
+        posts=posts,
+        total=total,
+        limit=limit,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{post_id}", response_model=PostResponse)
-def get_post(post_id: int, db: Session = Depends(get_db)) -> PostResponse:
+async def get_post(post_id: int, db: AsyncSession = Depends(get_db)) -> PostResponse:
     """
     Get a single post by ID.
 
@@ -161,40 +188,30 @@ def get_post(post_id: int, db: Session = Depends(get_db)) -> PostResponse:
     Raises:
         HTTPException: 404 if post not found, 500 for database errors
     """
-    try:
-        # Fetch post by primary key
-        post = db.get(Post, post_id)
+    # Serve repeated reads from the in-process cache when possible
+    cached = post_cache.get(post_id)
+    if cached is not None:
+        return cached
 
-        # Check if post exists
-        if not post:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Post with ID {post_id} not found",
-            )
+    # Fetch post by primary key; comments_count is a plain column read
+    post = await db.get(Post, post_id)
 
-        # Build response with current comments count
-        return PostResponse(
-            id=post.id,
-            title=post.title,
-            content=post.content,
-            author=post.author,
-            created_at=post.created_at,
-            updated_at=post.updated_at,
-            comments_count=len(post.comments) if post.comments else 0,
-        )
-    except HTTPException:
-        # Re-raise HTTP exceptions (like 404) without modification
-        raise
-    except Exception as e:
-        # Convert unexpected errors to HTTP 500
+    # Check if post exists
+    if not post:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve post: {str(e)}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post with ID {post_id} not found",
         )
 
+    # Cache and return the ORM row; comments_count is a plain column
+    post_cache[post_id] = post
+    return post
+
 
 @router.delete("/{post_id}", status_code=status.HTTP_200_OK)
-def delete_post(post_id: int, db: Session = Depends(get_db)) -> Dict[str, str]:
+async def delete_post(
+    post_id: int, db: AsyncSession = Depends(get_db)
+) -> Dict[str, str]:
     """
     Delete a post by ID.
 
@@ -210,131 +227,117 @@ def delete_post(post_id: int, db: Session = Depends(get_db)) -> Dict[str, str]:
     Raises:
         HTTPException: 404 if post not found, 500 for database errors
     """
-    try:
-        # Find the post to delete
-        post = db.get(Post, post_id)
-        if not post:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Post with ID {post_id} not found",
-            )
-
-        # Delete post (comments will be cascade deleted)
-        db.delete(post)
-        db.commit()
-
-        return {"message": f"Post with ID {post_id} deleted successfully"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
+    # Collect the comment ids this delete will cascade over, so their
+    # cache entries can be dropped along with the post's
+    comment_ids = (
+        await db.exec(select(Comment.id).where(Comment.post_id == post_id))
+    ).all()
+
+    # Delete in a single statement instead of loading the row first;
+    # comments are cascade-deleted by the database-side FK
+    result = await db.exec(delete(Post).where(Post.id == post_id))
+    await db.commit()
+    post_cache.pop(post_id, None)
+    for comment_id in comment_ids:
+        comment_cache.pop(comment_id, None)
+    if result.rowcount == 0:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete post: {str(e)}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post with ID {post_id} not found",
         )
 
+    return {"message": f"Post with ID {post_id} deleted successfully"}
+
 
 # Comments endpoints (nested under posts resource)
 
 
 @router.get("/{post_id}/comments", response_model=CommentListResponse)
-def get_comments(
-    post_id: int, page: int = 1, limit: int = 20, db: Session = Depends(get_db)
+async def get_comments(
+    post_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_db),
 ) -> CommentListResponse:
     """
-    Get paginated comments for a specific post.
+    Get paginated comments for a specific post using keyset (cursor) pagination.
 
     Args:
         post_id: ID of the post to get comments for
-        page: Page number (starts from 1)
+        cursor: Opaque token from a previous page's next_cursor (None for first page)
         limit: Number of comments per page (1-100)
         db: Database session dependency
 
     Returns:
-        CommentListResponse: Paginated list of comments with metadata
+        CommentListResponse: Page of comments with a next_cursor token when more exist
 
     Raises:
         HTTPException: 400 for invalid parameters, 404 if post not found, 500 for database errors
     """
     # Validate pagination parameters
-    if page < 1:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Page must be >= 1"
-        )
     if limit < 1 or limit > 100:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Limit must be between 1 and 100",
         )
 
-    try:
-        # Verify post exists
-        post = db.get(Post, post_id)
-        if not post:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Post with ID {post_id} not found",
-            )
+    cursor_key = decode_cursor(cursor) if cursor else None
 
-        # Calculate pagination
-        offset = (page - 1) * limit
-
-        # Get total comments count for this post
-        total_query = (
-            select(func.count()).select_from(Comment).where(Comment.post_id == post_id)
-        )
-        total = db.exec(total_query).one()
-
-        # Fetch comments with pagination
-        statement = (
-            select(Comment)
-            .where(Comment.post_id == post_id)
-            .offset(offset)
-            .limit(limit)
-            .order_by(Comment.created_at.asc())  # Chronological order for comments
-        )
-        comments = db.exec(statement).all()
-
-        # Convert to response format
-        comment_responses = [
-            CommentResponse(
-                id=comment.id,
-                content=comment.content,
-                author=comment.author,
-                post_id=comment.post_id,
-                parent_comment_id=comment.parent_comment_id,
-                created_at=comment.created_at,
-                updated_at=comment.updated_at,
-            )
-            for comment in comments
-        ]
-
-        # Calculate pagination metadata
-        total_pages = (total + limit - 1) // limit
-
-        return CommentListResponse(
-            comments=comment_responses,
-            total=total,
-            page=page,
-            limit=limit,
-            total_pages=total_pages,
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Verify post exists
+    post = await db.get(Post, post_id)
+    if not post:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch comments: {str(e)}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Post with ID {post_id} not found",
         )
 
+    # Fetch the next page by seeking past the cursor key instead of
+    # scanning and discarding OFFSET rows
+    statement = (
+        select(Comment)
+        .where(Comment.post_id == post_id)
+        .order_by(
+            Comment.created_at.asc(), Comment.id.asc()
+        )  # Chronological order for comments
+        .limit(limit)
+    )
+    if cursor_key:
+        statement = statement.where(tuple_(Comment.created_at, Comment.id) > cursor_key)
+
+    # Run the per-post COUNT and the page query concurrently
+    total_query = (
+        select(func.count()).select_from(Comment).where(Comment.post_id == post_id)
+    )
+    total, page_result = await asyncio.gather(run_count(total_query), db.exec(statement))
+    if total == 0:
+        return CommentListResponse.model_construct(
+            comments=[], total=0, limit=limit, next_cursor=None
+        )
+    comments = page_result.all()
+
+    # Only a full page can have more rows after it
+    next_cursor = None
+    if len(comments) == limit:
+        last_comment = comments[-1]
+        next_cursor = encode_cursor(last_comment.created_at, last_comment.id)
+
+    # Wrap without a validation pass; FastAPI's response_model step coerces
+    # the ORM rows into CommentResponse once, via from_attributes
+    return CommentListResponse.model_construct(
+        comments=comments,
+        total=total,
+        limit=limit,
+        next_cursor=next_cursor,
+    )
+
 
 @router.post(
     "/{post_id}/comments",
     status_code=status.HTTP_201_CREATED,
     response_model=CommentResponse,
 )
-def create_comment(
-    post_id: int, comment_data: CommentCreate, db: Session = Depends(get_db)
+async def create_comment(
+    post_id: int, comment_data: CommentCreate, db: AsyncSession = Depends(get_db)
 ) -> CommentResponse:
     """
     Create a new comment on a post.
@@ -352,59 +355,66 @@ def create_comment(
     Raises:
         HTTPException: 404 if post or parent comment not found, 500 for database errors
     """
-    try:
-        # Verify the post exists
-        post = db.get(Post, post_id)
-        if not post:
+    if comment_data.parent_comment_id is not None:
+        # Check post and parent comment in one round-trip: outer-join the
+        # parent onto the post row so a missing parent shows up as NULL
+        # while still reporting whether the post itself exists
+        row = (
+            await db.exec(
+                select(Post.id, Comment.post_id)
+                .select_from(Post)
+                .outerjoin(Comment, Comment.id == comment_data.parent_comment_id)
+                .where(Post.id == post_id)
+            )
+        ).first()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Post with ID {post_id} not found",
+            )
+        parent_post_id = row[1]
+        if parent_post_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Parent comment with ID {comment_data.parent_comment_id} not found",
+            )
+        # Ensure parent comment belongs to the same post
+        if parent_post_id != post_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parent comment must belong to the same post",
+            )
+    else:
+        # Top-level comment: only the post's existence matters, so fetch
+        # just its id rather than the whole row
+        post_exists = (
+            await db.exec(select(Post.id).where(Post.id == post_id))
+        ).first()
+        if not post_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Post with ID {post_id} not found",
             )
 
-        # If this is a reply, verify the parent comment exists and belongs to the same post
-        if comment_data.parent_comment_id is not None:
-            parent_comment = db.get(Comment, comment_data.parent_comment_id)
-            if not parent_comment:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Parent comment with ID {comment_data.parent_comment_id} not found",
-                )
-            # Ensure parent comment belongs to the same post
-            if parent_comment.post_id != post_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Parent comment must belong to the same post",
-                )
-
-        # Create new comment
-        db_comment = Comment(
-            content=comment_data.content,
-            author=comment_data.author,
-            post_id=post_id,
-            parent_comment_id=comment_data.parent_comment_id,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-        )
-
-        # Persist to database
-        db.add(db_comment)
-        db.commit()
-        db.refresh(db_comment)
-
-        return CommentResponse(
-            id=db_comment.id,
-            content=db_comment.content,
-            author=db_comment.author,
-            post_id=db_comment.post_id,
-            parent_comment_id=db_comment.parent_comment_id,
-            created_at=db_comment.created_at,
-            updated_at=db_comment.updated_at,
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create comment: {str(e)}",
-        )
+    # Create new comment; read the clock once for both timestamps
+    # (naive UTC, the form SQLite returns on reads)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db_comment = Comment(
+        content=comment_data.content,
+        author=comment_data.author,
+        post_id=post_id,
+        parent_comment_id=comment_data.parent_comment_id,
+        created_at=now,
+        updated_at=now,
+    )
+
+    # Persist to database; the generated id comes back with the INSERT,
+    # so no refresh SELECT is needed
+    db.add(db_comment)
+    await db.commit()
+
+    # The post's comments_count changed, so drop its cached row
+    post_cache.pop(post_id, None)
+
+    # Return the ORM row directly; response_model handles serialization
+    return db_comment
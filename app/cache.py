@@ -0,0 +1,13 @@
+"""
+In-process TTL caches for hot single-row reads.
+
+Each request runs on a fresh session, so SQLAlchemy's identity map is
+always cold; these caches serve repeated get_post/get_comment lookups
+from memory instead of SQLite. Write paths pop the affected ids, and
+the 30 second TTL bounds staleness across processes.
+"""
+
+from cachetools import TTLCache
+
+post_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+comment_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
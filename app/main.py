@@ -1,7 +1,37 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+
 from .api import posts, comments
+from .database import create_tables
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create tables and apply schema upgrades before serving requests"""
+    await create_tables()
+    yield
 
-app = FastAPI()
+
+# orjson serializes the response bodies noticeably faster than the stdlib
+# json encoder, which matters for the large comment-list payloads
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.include_router(posts.router)
 app.include_router(comments.router)
+
+
+@app.exception_handler(SQLAlchemyError)
+async def handle_sqlalchemy_error(request: Request, exc: SQLAlchemyError) -> JSONResponse:
+    """
+    Central handler for database errors.
+
+    Keeps route handlers free of per-request try/except wrappers; the
+    session dependency rolls back the failed transaction on its way out.
+    """
+    return JSONResponse(
+        status_code=500,
+        content={"detail": f"Database operation failed: {str(exc)}"},
+    )
@@ -1,18 +1,37 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, event, update
 from datetime import datetime, timezone
 from typing import Optional, List
 
+from app.models.post import Post
+
 
 class Comment(SQLModel, table=True):
     __tablename__ = "comments"
+    # Composite index covering the per-post comment listing: filter on
+    # post_id, order on created_at (id tiebreak rides on the implicit rowid).
+    # The parent index serves reply lookups and the ON DELETE CASCADE walk,
+    # which would otherwise scan the whole table on every comment delete.
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at", "post_id", "created_at"),
+        Index("ix_comments_parent", "parent_comment_id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     content: str
     author: Optional[str] = Field(default=None, max_length=100)
-    post_id: int = Field(foreign_key="posts.id")
-    parent_comment_id: Optional[int] = Field(default=None, foreign_key="comments.id")
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    post_id: int = Field(foreign_key="posts.id", ondelete="CASCADE")
+    parent_comment_id: Optional[int] = Field(
+        default=None, foreign_key="comments.id", ondelete="CASCADE"
+    )
+    # Naive UTC, matching what SQLite hands back on reads so responses
+    # serialize identically whether they come from memory or the database
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
 
     # Relationships
     post: "Post" = Relationship(back_populates="comments")
@@ -20,3 +39,26 @@ class Comment(SQLModel, table=True):
         back_populates="replies", sa_relationship_kwargs={"remote_side": "Comment.id"}
     )
     replies: List["Comment"] = Relationship(back_populates="parent")
+
+
+# Keep the denormalized posts.comments_count column in sync. Running the
+# UPDATE on the flush connection keeps it inside the same transaction as
+# the comment write itself.
+
+
+@event.listens_for(Comment, "after_insert")
+def _increment_comments_count(mapper, connection, target: Comment) -> None:
+    connection.execute(
+        update(Post)
+        .where(Post.id == target.post_id)
+        .values(comments_count=Post.comments_count + 1)
+    )
+
+
+@event.listens_for(Comment, "after_delete")
+def _decrement_comments_count(mapper, connection, target: Comment) -> None:
+    connection.execute(
+        update(Post)
+        .where(Post.id == target.post_id)
+        .values(comments_count=Post.comments_count - 1)
+    )
@@ -10,8 +10,17 @@ class Post(SQLModel, table=True):
     title: str = Field(max_length=255)
     content: str
     author: Optional[str] = Field(default=None, max_length=100)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Naive UTC, matching what SQLite hands back on reads so responses
+    # serialize identically whether they come from memory or the database
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+    # Denormalized comment count, kept in sync by ORM events on Comment
+    # (see app/models/comment.py) so list queries need no join/aggregate
+    comments_count: int = Field(default=0)
 
     # Relationship to comments
     comments: List["Comment"] = Relationship(back_populates="post")
@@ -1,42 +1,25 @@
 from sqlmodel import SQLModel
 from datetime import datetime
-from typing import Optional, List
-from pydantic import field_validator
+from typing import Annotated, Optional, List
+from pydantic import StringConstraints
+
+# Strip surrounding whitespace and reject empty strings inside
+# pydantic-core, without a Python-level validator call per field
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
 
 
 class CommentBase(SQLModel):
-    content: str
-    author: str
+    content: NonEmptyStr
+    author: NonEmptyStr
     parent_comment_id: Optional[int] = None
 
-    @field_validator("content")
-    @classmethod
-    def content_must_not_be_empty(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Content cannot be empty")
-        return v.strip()
-
-    @field_validator("author")
-    @classmethod
-    def author_must_not_be_empty(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Author cannot be empty")
-        return v.strip()
-
 
 class CommentCreate(CommentBase):
     pass
 
 
 class CommentUpdate(SQLModel):
-    content: str
-
-    @field_validator("content")
-    @classmethod
-    def content_must_not_be_empty(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Content cannot be empty")
-        return v.strip()
+    content: NonEmptyStr
 
 
 class CommentResponse(CommentBase):
@@ -51,6 +34,5 @@ class CommentResponse(CommentBase):
 class CommentListResponse(SQLModel):
     comments: List[CommentResponse]
     total: int
-    page: int
     limit: int
-    total_pages: int
+    next_cursor: Optional[str] = None
@@ -1,50 +1,26 @@
 from sqlmodel import SQLModel
 from datetime import datetime
-from typing import Optional, List
-from pydantic import field_validator
+from typing import Annotated, Optional, List
+from pydantic import StringConstraints
+
+# Strip surrounding whitespace and reject empty strings inside
+# pydantic-core, without a Python-level validator call per field
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
 
 
 class PostBase(SQLModel):
-    title: str
-    content: str
+    title: NonEmptyStr
+    content: NonEmptyStr
     author: str
 
-    @field_validator("title")
-    @classmethod
-    def title_must_not_be_empty(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Title cannot be empty")
-        return v.strip()
-
-    @field_validator("content")
-    @classmethod
-    def content_must_not_be_empty(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Content cannot be empty")
-        return v.strip()
-
 
 class PostCreate(PostBase):
     pass
 
 
 class PostUpdate(SQLModel):
-    title: Optional[str] = None
-    content: Optional[str] = None
-
-    @field_validator("title")
-    @classmethod
-    def title_must_not_be_empty(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None and (not v or not v.strip()):
-            raise ValueError("Title cannot be empty")
-        return v.strip() if v else v
-
-    @field_validator("content")
-    @classmethod
-    def content_must_not_be_empty(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None and (not v or not v.strip()):
-            raise ValueError("Content cannot be empty")
-        return v.strip() if v else v
+    title: Optional[NonEmptyStr] = None
+    content: Optional[NonEmptyStr] = None
 
 
 class PostResponse(PostBase):
@@ -57,6 +33,5 @@ class PostResponse(PostBase):
 class PostListResponse(SQLModel):
     posts: List[PostResponse]
     total: int
-    page: int
     limit: int
-    total_pages: int
+    next_cursor: Optional[str] = None